@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Measure the import time of the public modules with ``python -X importtime``
+and fail if a module imports a lazy dependency.
+
+Budgets are relative to the import time of ``asyncio`` measured in the same
+run, so that they do not depend on the speed of the machine. Timings are
+still noisy, exceeding a budget is only reported, unless ``--strict`` is set.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any
+
+BASELINE = "asyncio"
+
+# budget of the cumulative import time, as a multiple of the import time of
+# the baseline, and the modules that must not be imported.
+BUDGETS = {
+    "aioxmlrpc": (0.15, ["importlib.metadata"]),
+    "aioxmlrpc.client": (2.5, ["httpx", "importlib.metadata"]),
+    "aioxmlrpc.server": (3.5, ["httpx", "starlette", "uvicorn", "importlib.metadata"]),
+    "aioxmlrpc.scheduling": (2.0, ["httpx", "starlette", "uvicorn"]),
+    "aioxmlrpc.accesslog": (2.0, ["httpx", "starlette", "uvicorn"]),
+    "aioxmlrpc.loadtest": (3.5, ["httpx", "starlette", "uvicorn"]),
+}
+
+
+def import_time(module: str) -> tuple[float, set[str]]:
+    """
+    Return the cumulative import time of the module, in milliseconds,
+    and the name of all the imported modules.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    package = " " + module.split(".")[0]
+    total = 0
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        imported.add(name.strip())
+        # top level imports of the package, its dependencies are nested
+        if name.startswith(package):
+            total += int(cumulative)
+    return total / 1000, imported
+
+
+def best_import_time(module: str, runs: int) -> tuple[float, set[str]]:
+    """
+    Return the best import time of the module over the runs.
+    """
+    timings = []
+    imported: set[str] = set()
+    for _ in range(runs):
+        timing, imported = import_time(module)
+        timings.append(timing)
+    return min(timings), imported
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="keep the best of runs")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument(
+        "--strict", action="store_true", help="fail if a budget is exceeded"
+    )
+    args = parser.parse_args()
+
+    baseline, _ = best_import_time(BASELINE, args.runs)
+    results: dict[str, dict[str, Any]] = {}
+    failed = False
+    for module, (budget, lazy) in BUDGETS.items():
+        timing, imported = best_import_time(module, args.runs)
+        ratio = timing / baseline
+        eager = sorted(set(lazy) & imported)
+        within_budget = ratio <= budget
+        failed = failed or bool(eager) or (args.strict and not within_budget)
+        results[module] = {
+            "time_ms": timing,
+            "ratio": ratio,
+            "budget": budget,
+            "within_budget": within_budget,
+            "eager_imports": eager,
+        }
+
+    if args.json:
+        print(json.dumps({"baseline_ms": baseline, "modules": results}, indent=2))
+    else:
+        print(f"{BASELINE:24} {baseline:8.2f}ms baseline")
+        for module, result in results.items():
+            if result["eager_imports"]:
+                status = "FAILED " + ", ".join(result["eager_imports"])
+            elif not result["within_budget"]:
+                status = "over budget"
+            else:
+                status = "ok"
+            print(
+                f"{module:24} {result['time_ms']:8.2f}ms "
+                f"x{result['ratio']:.2f} / x{result['budget']} {status}"
+            )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
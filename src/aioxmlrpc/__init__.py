@@ -2,6 +2,13 @@
 XML-RPC Protocol for ``asyncio``
 """
 
-from importlib import metadata
 
-__version__ = metadata.version("aioxmlrpc")
+def __getattr__(name: str) -> str:
+    # importlib.metadata is slow to import, the version is looked up on demand
+    if name == "__version__":
+        from importlib import metadata
+
+        version = metadata.version("aioxmlrpc")
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
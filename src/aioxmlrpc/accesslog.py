@@ -0,0 +1,169 @@
+"""
+Access log of the XML-RPC server.
+
+Records are appended to a bounded in-memory buffer and written by batches
+from a background task, in a thread, so that logging never blocks the
+dispatch of the calls. When the buffer is full, records are dropped and
+counted.
+
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Optional
+
+__all__ = ["AccessLog", "AccessRecord"]
+
+log = logging.getLogger(__name__)
+access_log = logging.getLogger("aioxmlrpc.access")
+
+
+class AccessRecord:
+    """
+    Access log record of an XML-RPC request.
+    """
+
+    __slots__ = (
+        "client",
+        "method",
+        "calls",
+        "status",
+        "fault_code",
+        "duration",
+        "request_size",
+        "response_size",
+    )
+
+    def __init__(
+        self,
+        client: Optional[str] = None,
+        method: Optional[str] = None,
+        calls: int = 1,
+        status: int = 200,
+        fault_code: Optional[int] = None,
+        duration: float = 0.0,
+        request_size: int = 0,
+        response_size: int = 0,
+    ) -> None:
+        self.client = client
+        self.method = method
+        # number of sub-calls for system.multicall
+        self.calls = calls
+        self.status = status
+        self.fault_code = fault_code
+        self.duration = duration
+        self.request_size = request_size
+        self.response_size = response_size
+
+    def format(self) -> str:
+        fault = "-" if self.fault_code is None else self.fault_code
+        return (
+            f"{self.client or '-'} {self.method or '-'} {self.status} {fault} "
+            f"calls={self.calls} {self.duration * 1000:.2f}ms "
+            f"in={self.request_size} out={self.response_size}"
+        )
+
+
+def log_records(records: list[AccessRecord]) -> None:
+    """
+    Default sink of the access log, write records to the
+    ``aioxmlrpc.access`` logger.
+    """
+    if not access_log.isEnabledFor(logging.INFO):
+        return
+    for record in records:
+        access_log.info(record.format())
+
+
+class AccessLog:
+    """
+    Bounded and batched access log.
+
+    Records are written by batches of ``batch_size``, at least every
+    ``flush_interval`` seconds, by calling ``sink`` in a thread.
+    At most ``maxsize`` records are kept in memory, the others are dropped
+    and counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        sink: Callable[[list[AccessRecord]], None] = log_records,
+    ) -> None:
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sink = sink
+        self.flushed = 0
+        self.dropped = 0
+        self._buffer: deque[AccessRecord] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._stopping = False
+
+    def log(self, record: AccessRecord) -> None:
+        """
+        Append a record to the buffer, never blocks.
+        """
+        if len(self._buffer) >= self.maxsize:
+            self.dropped += 1
+            return
+        self._buffer.append(record)
+        if self._wakeup is not None and len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """
+        Start the background task writing the records.
+        """
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run(self._wakeup))
+
+    async def stop(self) -> None:
+        """
+        Stop the background task and write the pending records.
+        """
+        if self._task is not None and self._wakeup is not None:
+            # let the task finish writing its batch: cancelling it while the
+            # sink runs in a thread would leave the batch uncounted, and the
+            # sink would run concurrently with the final flush
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Write the buffered records, by batches.
+        """
+        if self.sink is log_records and not access_log.isEnabledFor(logging.INFO):
+            # nothing would be written, do not bother running the sink
+            self.flushed += len(self._buffer)
+            self._buffer.clear()
+            return
+        loop = asyncio.get_running_loop()
+        while self._buffer:
+            size = min(self.batch_size, len(self._buffer))
+            batch = [self._buffer.popleft() for _ in range(size)]
+            try:
+                await loop.run_in_executor(None, self.sink, batch)
+            except Exception:
+                log.error("Unable to write the access log", exc_info=True)
+                self.dropped += len(batch)
+            else:
+                self.flushed += len(batch)
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            await self.flush()
@@ -8,9 +8,13 @@ work with asyncio.
 
 import asyncio
 import logging
-import ssl
+import sys
+from array import array
+from collections import deque
 from typing import (
+    TYPE_CHECKING,
     Any,
+    AsyncIterator,
     Awaitable,
     Callable,
     Optional,
@@ -19,13 +23,20 @@ from typing import (
 )
 from xmlrpc import client as xmlrpc
 
-import httpx
+if TYPE_CHECKING:
+    import ssl
 
-__ALL__ = ["ServerProxy", "Fault", "ProtocolError", "MultiCall"]
+    import httpx
+
+__ALL__ = ["ServerProxy", "Fault", "ProtocolError", "MultiCall", "RowSchema"]
 
 RPCResult = Any
 RPCParameters = Any
 
+# header used to send the timeout of the request to the server, in seconds,
+# in order to let it abandon work that nobody will read.
+TIMEOUT_HEADER = "X-XMLRPC-Timeout"
+
 # you don't have to import xmlrpc.client from your code
 Fault = xmlrpc.Fault
 ProtocolError = xmlrpc.ProtocolError
@@ -50,6 +61,183 @@ class _Method:
         return ret
 
 
+class RowSchema:
+    """
+    Describe the rows of a response, in order to decode the matching structs
+    into compact objects instead of dictionaries.
+
+    ``row_type`` may be a dataclass, a ``NamedTuple`` or a class using
+    ``__slots__`` whose constructor accepts the fields as keyword arguments.
+    A struct is decoded as a row only if its members are exactly the fields
+    of the ``row_type``, any other struct is decoded as a ``dict``.
+
+    If ``columnar`` is set, the rows of an array are decoded as a ``dict``
+    of columns instead of a list of rows, where homogeneous integer and
+    float columns are stored in an ``array.array``. If the result is an
+    empty array, it is decoded as empty columns.
+    """
+
+    def __init__(self, row_type: type[Any], columnar: bool = False) -> None:
+        self.row_type = row_type
+        self.columnar = columnar
+        self.fields = tuple(sys.intern(field) for field in _get_fields(row_type))
+        self._field_set = frozenset(self.fields)
+
+    def match(self, keys: list[str]) -> bool:
+        # duplicated members are not a row, they are decoded as a dict
+        return len(keys) == len(self.fields) and self._field_set == set(keys)
+
+
+def _get_fields(row_type: type[Any]) -> tuple[str, ...]:
+    import dataclasses
+
+    if dataclasses.is_dataclass(row_type):
+        return tuple(field.name for field in dataclasses.fields(row_type))
+    if hasattr(row_type, "_fields"):
+        # NamedTuple
+        return tuple(row_type._fields)
+    slots = getattr(row_type, "__slots__", None)
+    if slots is None:
+        raise TypeError(
+            f"{row_type!r} is not a dataclass, a NamedTuple or a __slots__ class"
+        )
+    if isinstance(slots, str):
+        return (slots,)
+    return tuple(slots)
+
+
+class _Column:
+    # values of a column, stored in an array while they are homogeneous
+    # integers or floats.
+    __slots__ = ("values",)
+
+    def __init__(self) -> None:
+        self.values: Union[array[Any], list[Any], None] = None
+
+    def append(self, value: Any) -> None:
+        values = self.values
+        if values is None:
+            if type(value) is int:
+                self.values = array("q")
+            elif type(value) is float:
+                self.values = array("d")
+            else:
+                self.values = []
+            values = self.values
+        elif isinstance(values, array):
+            typ = int if values.typecode == "q" else float
+            if type(value) is not typ:
+                values = self.values = list(values)
+        try:
+            values.append(value)
+        except OverflowError:
+            values = self.values = list(values)
+            values.append(value)
+
+
+# placeholder of a row stored in the columns of its array
+_ROW: Any = object()
+
+
+class _SchemaUnmarshaller(xmlrpc.Unmarshaller):
+    """
+    Unmarshaller that decodes the structs matching a row schema.
+    """
+
+    dispatch = dict(xmlrpc.Unmarshaller.dispatch)
+
+    def __init__(
+        self,
+        schema: RowSchema,
+        use_datetime: bool = False,
+        use_builtin_types: bool = False,
+    ) -> None:
+        super().__init__(use_datetime, use_builtin_types)
+        self._schema = schema
+        self._containers: list[str] = []
+        self._columns: dict[int, list[_Column]] = {}
+
+    def start(self, tag: str, attrs: dict[str, str]) -> None:
+        # same as Unmarshaller.start, but keeps the kind of the open containers,
+        # inlined since it is called for every element.
+        if ":" in tag:
+            tag = tag.split(":")[-1]
+        if tag == "array" or tag == "struct":
+            self._marks.append(len(self._stack))
+            self._containers.append(tag)
+        self._data = []
+        if self._value and tag not in self.dispatch:
+            raise xmlrpc.ResponseError("unknown tag %r" % tag)
+        self._value = tag == "value"
+
+    def end_struct(self, data: str) -> None:
+        mark = self._marks.pop()
+        self._containers.pop()
+        items = self._stack[mark:]
+        keys = cast(list[str], items[::2])
+        schema = self._schema
+        if not schema.match(keys):
+            keys = [sys.intern(key) for key in keys]
+            self._stack[mark:] = [dict(zip(keys, items[1::2]))]
+            self._value = False
+            return
+
+        row = dict(zip(keys, items[1::2]))
+        if schema.columnar and self._containers and self._containers[-1] == "array":
+            columns = self._columns.get(self._marks[-1])
+            if columns is None:
+                columns = self._columns[self._marks[-1]] = [
+                    _Column() for _ in schema.fields
+                ]
+            for field, column in zip(schema.fields, columns):
+                column.append(row[field])
+            self._stack[mark:] = [_ROW]
+        else:
+            self._stack[mark:] = [schema.row_type(**row)]
+        self._value = False
+
+    dispatch["struct"] = end_struct  # type: ignore
+
+    def end_array(self, data: str) -> None:
+        mark = self._marks.pop()
+        self._containers.pop()
+        columns = self._columns.pop(mark, None)
+        items = self._stack[mark:]
+        if columns is None:
+            # only the result may be a list of rows for sure, a nested empty
+            # array is kept as is
+            if not items and self._schema.columnar and not self._containers:
+                self._stack[mark:] = [{field: [] for field in self._schema.fields}]
+            else:
+                self._stack[mark:] = [items]
+        elif all(item is _ROW for item in items):
+            fields = self._schema.fields
+            self._stack[mark:] = [
+                {field: column.values for field, column in zip(fields, columns)}
+            ]
+        else:
+            # rows mixed with other values, rebuild them
+            self._stack[mark:] = [self._rebuild_rows(items, columns)]
+        self._value = False
+
+    dispatch["array"] = end_array  # type: ignore
+
+    def _rebuild_rows(self, items: list[Any], columns: list[_Column]) -> list[Any]:
+        fields = self._schema.fields
+        row_type = self._schema.row_type
+        idx = 0
+        for pos, item in enumerate(items):
+            if item is _ROW:
+                items[pos] = row_type(
+                    **{
+                        field: column.values[idx]  # type: ignore
+                        for field, column in zip(fields, columns)
+                    }
+                )
+                idx += 1
+        return items
+
+
 class AioTransport(xmlrpc.Transport):
     """
     ``xmlrpc.Transport`` subclass for asyncio support
@@ -57,20 +245,24 @@ class AioTransport(xmlrpc.Transport):
 
     def __init__(
         self,
-        session: httpx.AsyncClient,
+        session: "httpx.AsyncClient",
         use_https: bool,
         *,
         use_datetime: bool = False,
         use_builtin_types: bool = False,
-        auth: Optional[httpx._types.AuthTypes] = None,
-        timeout: Optional[httpx._types.TimeoutTypes] = None,
+        auth: Optional["httpx._types.AuthTypes"] = None,
+        timeout: Optional["httpx._types.TimeoutTypes"] = None,
     ):
+        import httpx
+
         super().__init__(use_datetime, use_builtin_types)
         self.use_https = use_https
         self._session = session
 
         self.auth = auth or httpx.USE_CLIENT_DEFAULT
         self.timeout = timeout
+        # number of seconds the server has to respond, if bounded
+        self._deadline = httpx.Timeout(timeout).read if timeout is not None else None
 
     async def request(  # type: ignore
         self,
@@ -78,17 +270,23 @@ class AioTransport(xmlrpc.Transport):
         handler: str,
         request_body: bytes,
         verbose: bool = False,
+        *,
+        schema: Optional[RowSchema] = None,
     ) -> RPCResult:
         """
         Send the XML-RPC request, return the response.
         This method is a coroutine.
         """
         url = self._build_url(host, handler)
+        headers: dict[str, str] = {}
+        if self._deadline is not None:
+            headers[TIMEOUT_HEADER] = str(self._deadline)
         response = None
         try:
             response = await self._session.post(
                 url,
                 content=request_body,
+                headers=headers,
                 auth=self.auth,
                 timeout=self.timeout,
             )
@@ -116,16 +314,28 @@ class AioTransport(xmlrpc.Transport):
                 headers = {}
 
             raise ProtocolError(url, errcode, str(exc), headers)
-        return self.parse_response(body)
+        return self.parse_response(body, schema=schema)
 
     def parse_response(  # type: ignore
         self,
         body: str,
+        *,
+        schema: Optional[RowSchema] = None,
     ) -> RPCResult:
         """
         Parse the xmlrpc response.
+
+        If a schema is given, the structs matching it are decoded as rows.
         """
-        p, u = self.getparser()
+        if schema is None:
+            p, u = self.getparser()
+        else:
+            u = _SchemaUnmarshaller(
+                schema,
+                use_datetime=self._use_datetime,
+                use_builtin_types=self._use_builtin_types,
+            )
+            p = xmlrpc.ExpatParser(u)
         p.feed(body)
         p.close()
         return u.close()
@@ -152,12 +362,13 @@ class ServerProxy(xmlrpc.ServerProxy):
         allow_none: bool = False,
         use_datetime: bool = False,
         use_builtin_types: bool = False,
-        auth: Optional[httpx._types.AuthTypes] = None,
+        auth: Optional["httpx._types.AuthTypes"] = None,
         *,
         headers: Optional[dict[str, Any]] = None,
-        context: Optional[Union[bool, ssl.SSLContext]] = None,
-        timeout: httpx._types.TimeoutTypes = 5.0,
-        session: Optional[httpx.AsyncClient] = None,
+        context: Optional[Union[bool, "ssl.SSLContext"]] = None,
+        timeout: "httpx._types.TimeoutTypes" = 5.0,
+        session: Optional["httpx.AsyncClient"] = None,
+        schemas: Optional[dict[str, Union[type[Any], RowSchema]]] = None,
     ) -> None:
         if not headers:
             headers = {
@@ -167,7 +378,11 @@ class ServerProxy(xmlrpc.ServerProxy):
             }
         if context is None:
             context = True
-        self._session = session or httpx.AsyncClient(headers=headers, verify=context)
+        if session is None:
+            import httpx
+
+            session = httpx.AsyncClient(headers=headers, verify=context)
+        self._session = session
         transport = AioTransport(
             use_https=uri.startswith("https://"),
             session=self._session,
@@ -176,6 +391,10 @@ class ServerProxy(xmlrpc.ServerProxy):
             use_datetime=use_datetime,
             use_builtin_types=use_builtin_types,
         )
+        self.__schemas = {
+            method: schema if isinstance(schema, RowSchema) else RowSchema(schema)
+            for method, schema in (schemas or {}).items()
+        }
 
         super().__init__(
             uri,
@@ -198,7 +417,11 @@ class ServerProxy(xmlrpc.ServerProxy):
         ).encode(self.__encoding)
 
         response = await self.__transport.request(  # type: ignore
-            self.__host, self.__handler, request, verbose=self.__verbose
+            self.__host,
+            self.__handler,
+            request,
+            verbose=self.__verbose,
+            schema=self.__schemas.get(methodname),
         )
 
         if len(response) == 1:  # type: ignore
@@ -210,12 +433,64 @@ class ServerProxy(xmlrpc.ServerProxy):
         return _Method(self.__request, name)
 
 
+def _discard_result(future: "asyncio.Future[Any]") -> None:
+    if not future.cancelled():
+        future.exception()
+
+
 class MultiCall(xmlrpc.MultiCall):
     __server: ServerProxy
+    __call_list: list[tuple[str, RPCParameters]]
 
     async def __call__(self) -> xmlrpc.MultiCallIterator:  # type: ignore
+        return await self.__send(self.__call_list)
+
+    async def iter_chunks(
+        self, chunk_size: int = 1000, max_concurrency: int = 4
+    ) -> AsyncIterator[xmlrpc.MultiCallIterator]:
+        """
+        Send the queued calls by chunks of ``chunk_size`` calls, with at most
+        ``max_concurrency`` ``system.multicall`` requests in flight.
+
+        Yield a ``MultiCallIterator`` per chunk, in the order the calls have
+        been queued, as soon as the chunk and its predecessors are completed.
+
+        If the iteration is stopped early, wrap the generator in
+        ``contextlib.aclosing`` (or call its ``aclose()`` method on Python 3.9)
+        to cancel the requests still in flight right away, instead of when the
+        generator is garbage collected::
+
+            async with aclosing(multicall.iter_chunks()) as chunks:
+                async for chunk in chunks:
+                    ...
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than 0")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0")
+
+        call_list = self.__call_list
+        pending: deque[asyncio.Future[xmlrpc.MultiCallIterator]] = deque()
+        try:
+            for idx in range(0, len(call_list), chunk_size):
+                chunk = call_list[idx : idx + chunk_size]
+                pending.append(asyncio.ensure_future(self.__send(chunk)))
+                if len(pending) >= max_concurrency:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+                # the result of the chunks not yielded is discarded, retrieve
+                # their exception to avoid "Task exception was never retrieved"
+                task.add_done_callback(_discard_result)
+
+    async def __send(
+        self, call_list: list[tuple[str, RPCParameters]]
+    ) -> xmlrpc.MultiCallIterator:
         marshalled_list = []
-        for name, args in self.__call_list:
+        for name, args in call_list:
             marshalled_list.append({"methodName": name, "params": args})
 
         return xmlrpc.MultiCallIterator(
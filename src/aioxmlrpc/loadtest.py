@@ -0,0 +1,365 @@
+"""
+Load generator for XML-RPC servers.
+
+Drive an XML-RPC method of a server using :class:`aioxmlrpc.client.ServerProxy`
+and report the throughput, the latency percentiles and the error rates.
+
+Two modes are available:
+
+* the closed loop mode, where a fixed number of workers send a request as
+  soon as the previous one is completed;
+* the open loop mode, enabled with ``--rate``, where requests are sent at a
+  fixed rate whatever the server response time is. The latency is measured
+  from the time the request was scheduled, in order to avoid the coordinated
+  omission of the closed loop mode.
+
+Usage::
+
+    python -m aioxmlrpc.loadtest http://localhost:8000/RPC2 echo \\
+        --params '["{payload}"]' --payload-size 1024 --rate 500 --duration 30
+
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+from typing import Any, Optional
+
+from aioxmlrpc.client import Fault, RPCParameters, ServerProxy
+
+__all__ = ["LoadTestReport", "run_load_test", "main"]
+
+PAYLOAD_PLACEHOLDER = "{payload}"
+
+
+def render_params(template: RPCParameters, payload: str) -> RPCParameters:
+    """
+    Replace the ``{payload}`` placeholder in the parameters template.
+    """
+    if isinstance(template, str):
+        return template.replace(PAYLOAD_PLACEHOLDER, payload)
+    if isinstance(template, list):
+        return [render_params(param, payload) for param in template]
+    if isinstance(template, dict):
+        return {key: render_params(val, payload) for key, val in template.items()}
+    return template
+
+
+def percentile(latencies: list[float], pct: float) -> float:
+    """
+    Return the percentile of the sorted latencies, using the nearest rank.
+    """
+    if not latencies:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(latencies)), 1)
+    return latencies[rank - 1]
+
+
+class LoadTestReport:
+    """
+    Result of a load test.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        elapsed: float,
+        latencies: list[float],
+        faults: int,
+        errors: int,
+    ) -> None:
+        self.mode = mode
+        self.elapsed = elapsed
+        self.latencies = sorted(latencies)
+        self.faults = faults
+        self.errors = errors
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        requests = self.requests
+        return {
+            "mode": self.mode,
+            "requests": requests,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "faults": self.faults,
+            "errors": self.errors,
+            "fault_rate": self.faults / requests if requests else 0.0,
+            "error_rate": self.errors / requests if requests else 0.0,
+            "latency": {
+                "p50": percentile(self.latencies, 50),
+                "p90": percentile(self.latencies, 90),
+                "p99": percentile(self.latencies, 99),
+                "max": self.latencies[-1] if self.latencies else 0.0,
+            },
+        }
+
+    def format(self) -> str:
+        report = self.to_dict()
+        latency = report["latency"]
+        return "\n".join(
+            [
+                f"mode:        {report['mode']}",
+                f"requests:    {report['requests']} in {report['elapsed']:.2f}s",
+                f"throughput:  {report['throughput']:.1f} req/s",
+                f"faults:      {report['faults']} ({report['fault_rate']:.2%})",
+                f"errors:      {report['errors']} ({report['error_rate']:.2%})",
+                "latency:     "
+                + "  ".join(
+                    f"{name}={val * 1000:.2f}ms" for name, val in latency.items()
+                ),
+            ]
+        )
+
+
+class _Recorder:
+    def __init__(self, proxy: ServerProxy, method: str, params: RPCParameters):
+        self.call = getattr(proxy, method)
+        self.params = params
+        self.latencies: list[float] = []
+        self.faults = 0
+        self.errors = 0
+
+    async def send(self, started_at: float) -> None:
+        """
+        Send a request and record its latency from ``started_at``.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await self.call(*self.params)
+        except Fault:
+            self.faults += 1
+        except Exception:
+            self.errors += 1
+        self.latencies.append(loop.time() - started_at)
+
+
+async def _closed_loop(
+    recorder: _Recorder,
+    concurrency: int,
+    duration: Optional[float],
+    requests: Optional[int],
+) -> None:
+    loop = asyncio.get_running_loop()
+    end = loop.time() + duration if duration is not None else None
+    sent = 0
+
+    async def worker() -> None:
+        nonlocal sent
+        while (end is None or loop.time() < end) and (
+            requests is None or sent < requests
+        ):
+            sent += 1
+            await recorder.send(loop.time())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def _open_loop(
+    recorder: _Recorder,
+    rate: float,
+    concurrency: Optional[int],
+    duration: Optional[float],
+    requests: Optional[int],
+) -> None:
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+    pending: set[asyncio.Task[None]] = set()
+
+    async def send(scheduled_at: float) -> None:
+        if semaphore is None:
+            await recorder.send(scheduled_at)
+        else:
+            async with semaphore:
+                await recorder.send(scheduled_at)
+
+    if duration is not None:
+        # number of requests scheduled in the duration, rounded since
+        # duration * rate is subject to floating point errors
+        scheduled = math.ceil(round(duration * rate, 9))
+        requests = scheduled if requests is None else min(requests, scheduled)
+
+    start = loop.time()
+    idx = 0
+    while requests is None or idx < requests:
+        scheduled_at = start + idx / rate
+        delay = scheduled_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.ensure_future(send(scheduled_at))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        idx += 1
+    if pending:
+        await asyncio.wait(pending)
+
+
+async def run_load_test(
+    uri: str,
+    method: str,
+    params: RPCParameters = (),
+    *,
+    concurrency: Optional[int] = None,
+    rate: Optional[float] = None,
+    duration: Optional[float] = None,
+    requests: Optional[int] = None,
+    timeout: float = 5.0,
+    allow_none: bool = False,
+) -> LoadTestReport:
+    """
+    Call the method of the server at uri until the duration is elapsed or
+    the number of requests has been sent.
+
+    If a rate is set, requests are sent in open loop, and the concurrency,
+    if set, bounds the number of requests in flight. Otherwise, the
+    concurrency is the number of workers of the closed loop.
+    """
+    if duration is None and requests is None:
+        raise ValueError("duration or requests is required")
+    if duration is not None and duration <= 0:
+        raise ValueError("duration must be greater than 0")
+    if requests is not None and requests < 1:
+        raise ValueError("requests must be greater than 0")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be greater than 0")
+    if concurrency is not None and concurrency < 1:
+        raise ValueError("concurrency must be greater than 0")
+
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        headers={
+            "User-Agent": "python/aioxmlrpc-loadtest",
+            "Accept": "text/xml",
+            "Content-Type": "text/xml",
+        },
+        limits=limits,
+    ) as session:
+        proxy = ServerProxy(
+            uri, allow_none=allow_none, timeout=timeout, session=session
+        )
+        recorder = _Recorder(proxy, method, params)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        if rate is None:
+            await _closed_loop(recorder, concurrency or 1, duration, requests)
+            mode = "closed"
+        else:
+            await _open_loop(recorder, rate, concurrency, duration, requests)
+            mode = "open"
+        elapsed = loop.time() - start
+
+    return LoadTestReport(
+        mode, elapsed, recorder.latencies, recorder.faults, recorder.errors
+    )
+
+
+def _parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m aioxmlrpc.loadtest",
+        description="Load test an XML-RPC server.",
+    )
+    parser.add_argument("uri", help="URI of the XML-RPC server")
+    parser.add_argument("method", help="name of the method to call")
+    parser.add_argument(
+        "-p",
+        "--params",
+        default="[]",
+        help=(
+            "JSON list of parameters, the string {payload} is replaced by "
+            "the payload (default: [])"
+        ),
+    )
+    parser.add_argument(
+        "-s",
+        "--payload-size",
+        type=int,
+        default=0,
+        help="size of the payload in bytes (default: 0)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        help=(
+            "number of workers in closed loop (default: 1), "
+            "max number of requests in flight in open loop (default: unbounded)"
+        ),
+    )
+    parser.add_argument(
+        "-r",
+        "--rate",
+        type=float,
+        help="number of requests per second, enables the open loop mode",
+    )
+    parser.add_argument(
+        "-d", "--duration", type=float, help="duration of the test in seconds"
+    )
+    parser.add_argument("-n", "--requests", type=int, help="number of requests")
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        default=5.0,
+        help="timeout of a request in seconds (default: 5)",
+    )
+    parser.add_argument(
+        "--allow-none", action="store_true", help="allow None in parameters"
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="log the errors of requests"
+    )
+    args = parser.parse_args(argv)
+    if args.duration is None and args.requests is None:
+        args.duration = 10.0
+    if args.duration is not None and args.duration <= 0:
+        parser.error("--duration must be greater than 0")
+    if args.requests is not None and args.requests < 1:
+        parser.error("--requests must be greater than 0")
+    try:
+        args.params = json.loads(args.params)
+    except ValueError as exc:
+        parser.error(f"invalid --params: {exc}")
+    if not isinstance(args.params, list):
+        parser.error("--params must be a JSON list")
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.ERROR if args.verbose else logging.CRITICAL)
+    params = render_params(args.params, "x" * args.payload_size)
+    report = asyncio.run(
+        run_load_test(
+            args.uri,
+            args.method,
+            params,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            duration=args.duration,
+            requests=args.requests,
+            timeout=args.timeout,
+            allow_none=args.allow_none,
+        )
+    )
+    if args.json:
+        json.dump(report.to_dict(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Scheduling of the XML-RPC calls of a server.
+
+Methods are assigned to priority classes, each class having its own
+concurrency budget. When the budget of a class is exhausted, calls are
+queued and served with weighted fair queuing across the client identities,
+so a client flooding a class does not starve the other clients, and does
+not slow down the methods of the other classes.
+
+"""
+
+import asyncio
+import heapq
+from itertools import count
+from typing import Optional
+
+__all__ = ["PriorityClass", "Scheduler"]
+
+ClientId = Optional[str]
+
+
+class PriorityClass:
+    """
+    Concurrency budget of a group of methods.
+
+    ``max_concurrency`` is the number of calls running at the same time,
+    ``None`` means unbounded. The time spent by calls waiting for the budget
+    is measured in ``wait_count``, ``wait_time`` and ``max_wait_time``, and
+    ``cancel_count`` is the number of calls cancelled while waiting, by their
+    deadline or the disconnection of their client.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: Optional[int] = None,
+        weights: Optional[dict[ClientId, float]] = None,
+    ) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.weights = weights if weights is not None else {}
+        self.active = 0
+        self.wait_count = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.cancel_count = 0
+        self._queue: list[tuple[float, int, ClientId, asyncio.Future[None]]] = []
+        self._seq = count()
+        self._virtual_time = 0.0
+        # last finish tag and number of queued calls per client
+        self._finish: dict[ClientId, float] = {}
+        self._queued: dict[ClientId, int] = {}
+        # the queue keeps the cancelled calls until they are popped
+        self._waiting = 0
+
+    @property
+    def queued(self) -> int:
+        return self._waiting
+
+    @property
+    def mean_wait_time(self) -> float:
+        return self.wait_time / self.wait_count if self.wait_count else 0.0
+
+    async def acquire(self, client: ClientId = None) -> None:
+        """
+        Wait until the call of the client can run.
+        """
+        if self.max_concurrency is None or (
+            self.active < self.max_concurrency and not self._queue
+        ):
+            self.active += 1
+            self._record_wait(0.0)
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        finish = max(self._virtual_time, self._finish.get(client, 0.0))
+        finish += 1 / self.weights.get(client, 1.0)
+        self._finish[client] = finish
+        self._queued[client] = self._queued.get(client, 0) + 1
+        heapq.heappush(self._queue, (finish, next(self._seq), client, waiter))
+        self._waiting += 1
+
+        queued_at = loop.time()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot has been given while the call was cancelled
+                self.release()
+            else:
+                self._waiting -= 1
+                self.cancel_count += 1
+            self._record_wait(loop.time() - queued_at)
+            raise
+        self._record_wait(loop.time() - queued_at)
+
+    def release(self) -> None:
+        """
+        Release the slot of a call, and give it to the next queued call.
+        """
+        while self._queue:
+            finish, _, client, waiter = heapq.heappop(self._queue)
+            self._virtual_time = finish
+            self._queued[client] -= 1
+            if not self._queued[client]:
+                del self._queued[client]
+                del self._finish[client]
+            if not waiter.done():
+                waiter.set_result(None)
+                self._waiting -= 1
+                return
+        self.active -= 1
+
+    def _record_wait(self, wait_time: float) -> None:
+        self.wait_count += 1
+        self.wait_time += wait_time
+        if wait_time > self.max_wait_time:
+            self.max_wait_time = wait_time
+
+
+class Scheduler:
+    """
+    Assign methods to priority classes.
+
+    Methods that are not assigned to any class are not scheduled.
+    ``weights`` is the share of the clients in every class, by client
+    identity, the default weight being 1.
+    """
+
+    def __init__(self) -> None:
+        self.classes: dict[str, PriorityClass] = {}
+        self.methods: dict[str, PriorityClass] = {}
+        self.weights: dict[ClientId, float] = {}
+
+    def add_class(
+        self, name: str, max_concurrency: Optional[int] = None
+    ) -> PriorityClass:
+        priority_class = PriorityClass(name, max_concurrency, self.weights)
+        self.classes[name] = priority_class
+        return priority_class
+
+    def assign(self, method: str, name: str) -> None:
+        try:
+            self.methods[method] = self.classes[name]
+        except KeyError:
+            raise ValueError(f'priority class "{name}" does not exist') from None
+
+    def get_class(self, method: str) -> Optional[PriorityClass]:
+        return self.methods.get(method)
@@ -10,9 +10,15 @@ Handle RPC of classic and coroutine functions
 
 import asyncio
 import inspect
+import math
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import partial
 from types import TracebackType
 from typing import (
+    TYPE_CHECKING,
     Any,
+    AsyncIterator,
     Awaitable,
     Callable,
     Coroutine,
@@ -24,28 +30,103 @@ from typing import (
 from xmlrpc import server
 from xmlrpc.client import loads, dumps, Fault
 
-import uvicorn
-from starlette.applications import Starlette
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.routing import Route
+from aioxmlrpc.accesslog import AccessLog, AccessRecord
+from aioxmlrpc.client import TIMEOUT_HEADER
+from aioxmlrpc.scheduling import ClientId, Scheduler
+
+if TYPE_CHECKING:
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import Response
 
 
 __all__ = ["SimpleXMLRPCDispatcher", "SimpleXMLRPCServer"]
 
 _Marshallable = Any
 
+# fault code returned when the client deadline is reached before the
+# method completes.
+DEADLINE_EXCEEDED = -32400
+
+
+class _Deadline:
+    """
+    Deadline of a request, in event loop time.
+
+    A single timer is armed for the request, it cancels the tasks of the
+    calls that are running when the deadline is reached.
+    """
+
+    def __init__(self, when: float) -> None:
+        self.when = when
+        self.expired = False
+        self.tasks: set[asyncio.Task[Any]] = set()
+        self._timer = asyncio.get_running_loop().call_at(when, self._expire)
+
+    def _expire(self) -> None:
+        self.expired = True
+        for task in self.tasks:
+            task.cancel()
+
+    def check(self) -> None:
+        if self.expired:
+            raise Fault(DEADLINE_EXCEEDED, "deadline exceeded")
+
+    def cancel(self) -> None:
+        self._timer.cancel()
+
+
+# deadline of the request being dispatched.
+_deadline: ContextVar[Optional[_Deadline]] = ContextVar(
+    "aioxmlrpc_deadline", default=None
+)
+
+# identity of the client of the request being dispatched.
+_client: ContextVar[ClientId] = ContextVar("aioxmlrpc_client", default=None)
+
 
 class SimpleXMLRPCDispatcher(server.SimpleXMLRPCDispatcher):
-    async def _marshaled_dispatch(self, data: str) -> bytes:  # type: ignore
+    def __init__(
+        self,
+        allow_none: bool = False,
+        encoding: Optional[str] = None,
+        use_builtin_types: bool = False,
+    ) -> None:
+        super().__init__(allow_none, encoding, use_builtin_types)
+        self.scheduler = Scheduler()
+
+    async def _marshaled_dispatch(  # type: ignore
+        self,
+        data: str,
+        *,
+        deadline: Optional[float] = None,
+        client: ClientId = None,
+        record: Optional[AccessRecord] = None,
+    ) -> bytes:
         """
         Override function from SimpleXMLRPCDispatcher to handle coroutines RPC case
+
+        The optional deadline, in event loop time, is enforced on every
+        dispatched method, including the ``system.multicall`` sub-calls.
+        The client identity is used to schedule the methods fairly.
+        The access log record, if any, is filled with the method, the number
+        of calls and the fault code.
         """
+        scope = _Deadline(deadline) if deadline is not None else None
+        deadline_token = _deadline.set(scope)
+        client_token = _client.set(client)
         try:
             params, method = loads(data, use_builtin_types=self.use_builtin_types)
             if method is None:
                 raise ValueError("Invalid")
 
+            if record is not None:
+                record.method = method
+                if method == "system.multicall" and params:
+                    calls = params[0]
+                    if isinstance(calls, list):
+                        record.calls = len(calls)
+
             response = await self._dispatch(method, params)
             # wrap response in a singleton tuple
             response = (response,)
@@ -56,14 +137,23 @@ class SimpleXMLRPCDispatcher(server.SimpleXMLRPCDispatcher):
                 encoding=self.encoding,
             )
         except Fault as fault:
+            if record is not None:
+                record.fault_code = fault.faultCode
             response = dumps(fault, allow_none=self.allow_none, encoding=self.encoding)
         except Exception as exc:
+            if record is not None:
+                record.fault_code = 1
             # report exception back to server
             response = dumps(
                 Fault(1, "%s:%s" % (type(exc), exc)),
                 encoding=self.encoding,
                 allow_none=self.allow_none,
             )
+        finally:
+            if scope is not None:
+                scope.cancel()
+            _deadline.reset(deadline_token)
+            _client.reset(client_token)
 
         return response.encode(self.encoding, "xmlcharrefreplace")
 
@@ -73,7 +163,51 @@ class SimpleXMLRPCDispatcher(server.SimpleXMLRPCDispatcher):
         """
         Override function from SimpleXMLRPCDispatcher to handle coroutine
         RPC call
+
+        Methods assigned to a priority class wait for a slot of the class
+        before being called.
+
+        If the request has a deadline, the call is cancelled when it is
+        reached, and a fault is raised. ``system.multicall`` is not bound
+        to the deadline, each of its sub-calls is.
         """
+        deadline = _deadline.get()
+        if deadline is None or method == "system.multicall":
+            return await self._schedule(method, params)
+
+        deadline.check()
+        task = asyncio.current_task()
+        if task is None:
+            return await self._schedule(method, params)  # coverage: ignore
+        deadline.tasks.add(task)
+        try:
+            return await self._schedule(method, params)
+        except asyncio.CancelledError:
+            if not deadline.expired:
+                raise
+            if hasattr(task, "uncancel"):
+                # the cancellation is consumed, python 3.11+
+                task.uncancel()
+            raise Fault(DEADLINE_EXCEEDED, "deadline exceeded") from None
+        finally:
+            deadline.tasks.discard(task)
+
+    async def _schedule(
+        self, method: str, params: Iterable[_Marshallable]
+    ) -> _Marshallable:
+        priority_class = self.scheduler.get_class(method)
+        if priority_class is None:
+            return await self._call(method, params)
+
+        await priority_class.acquire(_client.get())
+        try:
+            return await self._call(method, params)
+        finally:
+            priority_class.release()
+
+    async def _call(
+        self, method: str, params: Iterable[_Marshallable]
+    ) -> _Marshallable:
         func = None
         try:
             # check to see if a matching function has been registered
@@ -107,6 +241,52 @@ class SimpleXMLRPCDispatcher(server.SimpleXMLRPCDispatcher):
         else:
             raise Exception('method "%s" is not supported' % method)
 
+    @overload  # type: ignore
+    def register_function(
+        self,
+        function: Callable[..., _Marshallable],
+        name: Optional[str] = None,
+        *,
+        priority: Optional[str] = None,
+    ) -> Callable[..., _Marshallable]: ...
+
+    @overload
+    def register_function(
+        self,
+        function: Coroutine[Awaitable[_Marshallable], Any, Any],
+        name: Optional[str] = None,
+        *,
+        priority: Optional[str] = None,
+    ) -> Coroutine[Awaitable[_Marshallable], Any, Any]: ...
+
+    @overload
+    def register_function(
+        self,
+        function: None = None,
+        name: Optional[str] = None,
+        *,
+        priority: Optional[str] = None,
+    ) -> Callable[[Callable[..., _Marshallable]], Callable[..., _Marshallable]]: ...
+
+    def register_function(  # type: ignore
+        self,
+        function: Any = None,
+        name: Optional[str] = None,
+        *,
+        priority: Optional[str] = None,
+    ) -> Any:
+        """
+        Register a function, optionally assigned to a priority class previously
+        added to the scheduler.
+
+        If the function is omitted, it can be used as a decorator.
+        """
+        if function is None:
+            return partial(self.register_function, name=name, priority=priority)
+        if priority is not None:
+            self.scheduler.assign(name or function.__name__, priority)
+        return super().register_function(function, name)
+
     async def system_multicall(self, call_list: list[dict[str, _Marshallable]]):  # type: ignore
         async def handle_call(call: dict[str, _Marshallable]) -> _Marshallable:
             method_name = call["methodName"]
@@ -117,6 +297,8 @@ class SimpleXMLRPCDispatcher(server.SimpleXMLRPCDispatcher):
                 return [result]
             except Fault as fault:
                 return {"faultCode": fault.faultCode, "faultString": fault.faultString}
+            except asyncio.CancelledError:
+                raise
             except BaseException as exc:
                 return {"faultCode": 1, "faultString": f"{type(exc).__name__}:{exc}"}
 
@@ -125,6 +307,8 @@ class SimpleXMLRPCDispatcher(server.SimpleXMLRPCDispatcher):
 
 class SimpleXMLRPCServer(SimpleXMLRPCDispatcher):
     rpc_paths = ["/", "/RPC2", "/xmlrpc"]
+    # greatest timeout accepted from the client, in seconds
+    max_timeout = 3600.0
 
     def __init__(
         self,
@@ -133,48 +317,124 @@ class SimpleXMLRPCServer(SimpleXMLRPCDispatcher):
         allow_none: bool = False,
         encoding: Optional[str] = None,
         use_builtin_types: bool = False,
+        *,
+        client_header: Optional[str] = None,
+        access_log: Optional[AccessLog] = None,
     ) -> None:
+        from starlette.applications import Starlette
+        from starlette.responses import Response
+        from starlette.routing import Route
+
         super().__init__(allow_none, encoding, use_builtin_types)
+        # starlette is imported lazily, the response class is resolved once
+        self._response_class = Response
         self.host, self.port = addr
         self.logRequests = logRequests
+        self.client_header = client_header
+        if logRequests and access_log is None:
+            access_log = AccessLog()
+        self.access_log = access_log if logRequests else None
         self.app = Starlette(
             routes=[
                 Route(route, self.handle_xmlrpc, methods=["POST"])
                 for route in self.rpc_paths
             ],
+            lifespan=self._lifespan,
         )
 
-    async def handle_xmlrpc(self, request: Request) -> Response:
+    @asynccontextmanager
+    async def _lifespan(self, app: "Starlette") -> AsyncIterator[None]:
+        if self.access_log is not None:
+            await self.access_log.start()
+        try:
+            yield
+        finally:
+            if self.access_log is not None:
+                await self.access_log.stop()
+
+    async def handle_xmlrpc(self, request: "Request") -> "Response":
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
         body = await request.body()
-        response = await self._marshaled_dispatch(body.decode())
-        return Response(response, media_type="text/xml")
+        client = self._get_client(request)
+        record = None
+        if self.access_log is not None:
+            record = AccessRecord(client, request_size=len(body))
+        response = await self._handle_xmlrpc(request, body, client, record)
+        if record is not None and self.access_log is not None:
+            record.status = response.status_code
+            record.response_size = len(response.body)
+            record.duration = loop.time() - started_at
+            self.access_log.log(record)
+        return response
+
+    async def _handle_xmlrpc(
+        self,
+        request: "Request",
+        body: bytes,
+        client: ClientId,
+        record: Optional[AccessRecord],
+    ) -> "Response":
+        dispatch = asyncio.ensure_future(
+            self._marshaled_dispatch(
+                body.decode(),
+                deadline=self._get_deadline(request),
+                client=client,
+                record=record,
+            )
+        )
+        disconnect = asyncio.ensure_future(self._wait_for_disconnect(request))
+        try:
+            await asyncio.wait(
+                {dispatch, disconnect}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            disconnect.cancel()
+            if not dispatch.done():
+                # the client is gone, nobody will read the response
+                dispatch.cancel()
+        if not dispatch.done():
+            return self._response_class(status_code=499)
+        return self._response_class(dispatch.result(), media_type="text/xml")
+
+    def _get_deadline(self, request: "Request") -> Optional[float]:
+        """
+        Compute the deadline of the request from the timeout sent by the client.
+
+        Timeouts that are not finite, not positive or greater than
+        ``max_timeout`` are ignored.
+        """
+        try:
+            timeout = float(request.headers[TIMEOUT_HEADER])
+        except (KeyError, ValueError):
+            return None
+        if not (math.isfinite(timeout) and 0 < timeout <= self.max_timeout):
+            return None
+        return asyncio.get_running_loop().time() + timeout
+
+    def _get_client(self, request: "Request") -> ClientId:
+        """
+        Identify the client, by the client header if set, or by its address.
+        """
+        if self.client_header and self.client_header in request.headers:
+            return request.headers[self.client_header]
+        return request.client.host if request.client else None
+
+    async def _wait_for_disconnect(self, request: "Request") -> None:
+        while True:
+            message = await request.receive()
+            if message["type"] == "http.disconnect":
+                return
 
     def serve_forever(self) -> asyncio.Task[Any]:
+        import uvicorn
+
         config = uvicorn.Config(
             self.app, host=self.host, port=self.port, log_level="error", loop="asyncio"
         )
         self.server = uvicorn.Server(config)
         return asyncio.create_task(self.server.serve())
 
-    @overload  # type: ignore
-    def register_function(
-        self, function: Callable[..., _Marshallable], name: Optional[str] = None
-    ) -> Callable[..., _Marshallable]: ...
-
-    @overload
-    def register_function(
-        self,
-        function: Coroutine[Awaitable[_Marshallable], Any, Any],
-        name: Optional[str] = None,
-    ) -> Coroutine[Awaitable[_Marshallable], Any, Any]: ...
-
-    def register_function(  # type: ignore
-        self,
-        function: Any,
-        name: Optional[str] = None,
-    ) -> Any:
-        super().register_function(function, name)
-
     async def __aenter__(self) -> "SimpleXMLRPCServer":
         return self
 
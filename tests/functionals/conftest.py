@@ -27,6 +27,18 @@ async def multiply(a: int, b: int) -> int:
     return a * b
 
 
+cancelled_sleeps: list[float] = []
+
+
+async def sleep(delay: float) -> float:
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        cancelled_sleeps.append(delay)
+        raise
+    return delay
+
+
 class ExampleService:
     def get_data(self):
         return "42"
@@ -43,6 +55,7 @@ async def server():
     async with SimpleXMLRPCServer(addr) as server:
         server.register_function(pow)
         server.register_function(multiply)
+        server.register_function(sleep)
         server.register_function(lambda x, y: x + y, "add")  # type: ignore
 
         @server.register_function
@@ -60,6 +73,12 @@ async def server():
         await task
 
 
+@pytest.fixture
+def cancelled() -> list[float]:
+    cancelled_sleeps.clear()
+    return cancelled_sleeps
+
+
 @pytest.fixture
 async def client(server: str) -> ServerProxy:
     return ServerProxy(server)
@@ -1,5 +1,10 @@
+import asyncio
 from datetime import datetime
-from aioxmlrpc.client import ServerProxy, MultiCall
+
+import pytest
+
+from aioxmlrpc.client import Fault, MultiCall, ProtocolError, ServerProxy
+from aioxmlrpc.loadtest import run_load_test
 
 
 async def test_method(client: ServerProxy):
@@ -30,3 +35,42 @@ async def test_multicall(client: ServerProxy):
     resp = await multicall()
     assert resp[0] == 16
     assert resp[1] == 6
+
+
+async def test_timeout_cancel_server_work(server: str, cancelled: list[float]):
+    client = ServerProxy(server, timeout=0.2)
+    with pytest.raises(ProtocolError):
+        await client.sleep(5)
+    for _ in range(20):
+        if cancelled:
+            break
+        await asyncio.sleep(0.05)
+    assert cancelled == [5]
+
+
+async def test_multicall_iter_chunks(client: ServerProxy):
+    multicall = MultiCall(client)
+    for i in range(10):
+        multicall.add(i, 0)
+    multicall.pow("4", 2)
+    chunks = [resp async for resp in multicall.iter_chunks(3, max_concurrency=2)]
+    assert len(chunks) == 4
+    assert [chunk[i] for chunk in chunks[:3] for i in range(3)] == list(range(9))
+    assert chunks[3][0] == 9
+    with pytest.raises(Fault):
+        chunks[3][1]
+
+
+async def test_load_test_closed_loop(server: str):
+    report = await run_load_test(server, "multiply", [4, 2], concurrency=4, requests=40)
+    assert report.mode == "closed"
+    assert report.requests == 40
+    assert report.errors == report.faults == 0
+
+
+async def test_load_test_open_loop(server: str):
+    report = await run_load_test(server, "pow", ["4", 2], rate=200, duration=0.1)
+    assert report.mode == "open"
+    assert report.requests == 20
+    assert report.faults == 20
+    assert report.errors == 0
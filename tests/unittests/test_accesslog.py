@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from aioxmlrpc.accesslog import AccessLog, AccessRecord, log_records
+
+
+class Sink:
+    def __init__(self):
+        self.batches: list[list[AccessRecord]] = []
+
+    def __call__(self, records: list[AccessRecord]) -> None:
+        self.batches.append(records)
+
+
+class SlowSink(Sink):
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.resume = threading.Event()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, records: list[AccessRecord]) -> None:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        self.started.set()
+        self.resume.wait(5)
+        super().__call__(records)
+        self.running -= 1
+
+
+def failing_sink(records: list[AccessRecord]) -> None:
+    raise OSError("disk full")
+
+
+def test_format():
+    record = AccessRecord(
+        "127.0.0.1",
+        "system.multicall",
+        calls=3,
+        fault_code=4,
+        duration=0.0125,
+        request_size=120,
+        response_size=340,
+    )
+    assert record.format() == (
+        "127.0.0.1 system.multicall 200 4 calls=3 12.50ms in=120 out=340"
+    )
+    assert AccessRecord().format() == "- - 200 - calls=1 0.00ms in=0 out=0"
+
+
+def test_log_records(caplog: pytest.LogCaptureFixture):
+    with caplog.at_level(logging.INFO, logger="aioxmlrpc.access"):
+        log_records([AccessRecord(method="ping")])
+    assert caplog.messages == ["- ping 200 - calls=1 0.00ms in=0 out=0"]
+
+
+async def test_flush_batches():
+    sink = Sink()
+    access_log = AccessLog(batch_size=2, sink=sink)
+    for method in "abcde":
+        access_log.log(AccessRecord(method=method))
+    await access_log.flush()
+    assert [[r.method for r in batch] for batch in sink.batches] == [
+        ["a", "b"],
+        ["c", "d"],
+        ["e"],
+    ]
+    assert access_log.flushed == 5
+
+
+async def test_drop_on_overflow():
+    sink = Sink()
+    access_log = AccessLog(maxsize=2, sink=sink)
+    for method in "abc":
+        access_log.log(AccessRecord(method=method))
+    await access_log.flush()
+    assert [r.method for r in sink.batches[0]] == ["a", "b"]
+    assert access_log.dropped == 1
+
+
+async def test_background_task():
+    sink = Sink()
+    access_log = AccessLog(batch_size=2, flush_interval=60, sink=sink)
+    await access_log.start()
+    access_log.log(AccessRecord(method="a"))
+    access_log.log(AccessRecord(method="b"))
+    for _ in range(100):
+        if sink.batches:
+            break
+        await asyncio.sleep(0.01)
+    assert [r.method for r in sink.batches[0]] == ["a", "b"]
+
+    access_log.log(AccessRecord(method="c"))
+    await access_log.stop()
+    assert [r.method for r in sink.batches[1]] == ["c"]
+    assert access_log.flushed == 3
+
+
+async def test_sink_error():
+    access_log = AccessLog(sink=failing_sink)
+    access_log.log(AccessRecord(method="a"))
+    await access_log.flush()
+    assert access_log.dropped == 1
+    assert access_log.flushed == 0
+
+
+async def test_stop_while_writing():
+    sink = SlowSink()
+    access_log = AccessLog(batch_size=2, flush_interval=60, sink=sink)
+    await access_log.start()
+    access_log.log(AccessRecord(method="a"))
+    access_log.log(AccessRecord(method="b"))
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, sink.started.wait, 5)
+
+    access_log.log(AccessRecord(method="c"))
+    stop = asyncio.ensure_future(access_log.stop())
+    await asyncio.sleep(0.01)
+    assert not stop.done()
+    sink.resume.set()
+    await stop
+    assert [[r.method for r in batch] for batch in sink.batches] == [
+        ["a", "b"],
+        ["c"],
+    ]
+    assert sink.max_running == 1
+    assert access_log.flushed == 3
+    assert access_log.dropped == 0
+
+
+async def test_flush_disabled_logger(monkeypatch: pytest.MonkeyPatch):
+    def run_in_executor(*args):
+        raise AssertionError("the sink must not be called")
+
+    loop = asyncio.get_running_loop()
+    monkeypatch.setattr(loop, "run_in_executor", run_in_executor)
+    monkeypatch.setattr(logging.getLogger("aioxmlrpc.access"), "level", logging.WARNING)
+    access_log = AccessLog()
+    access_log.log(AccessRecord(method="a"))
+    await access_log.flush()
+    assert access_log.flushed == 1
@@ -1,9 +1,15 @@
+import asyncio
+import gc
 import ssl
+from array import array
+from dataclasses import dataclass
+from typing import NamedTuple
+from xmlrpc.client import dumps
 
 import pytest
-from httpx import Request, Response
+from httpx import Request, Response, Timeout
 
-from aioxmlrpc.client import Fault, MultiCall, ProtocolError, ServerProxy
+from aioxmlrpc.client import Fault, MultiCall, ProtocolError, RowSchema, ServerProxy
 
 RESPONSES = {
     "http://localhost/test_xmlrpc_ok": {
@@ -64,6 +70,67 @@ RESPONSES = {
 </methodResponse>
 """,
     },
+    "http://localhost/test_xmlrpc_rows": {
+        "status": 200,
+        "body": dumps(
+            (
+                [
+                    {"id": 1, "name": "one"},
+                    {"name": "two", "id": 2},
+                    {"total": 2},
+                ],
+            ),
+            methodresponse=True,
+        ),
+    },
+    "http://localhost/test_xmlrpc_columns": {
+        "status": 200,
+        "body": dumps(
+            (
+                [
+                    {"id": 1, "name": "one"},
+                    {"name": "two", "id": 2},
+                    {"id": 3, "name": "three"},
+                ],
+            ),
+            methodresponse=True,
+        ),
+    },
+    "http://localhost/test_xmlrpc_duplicate_members": {
+        "status": 200,
+        "body": """<?xml version="1.0"?>
+<methodResponse>
+  <params>
+    <param>
+      <value>
+        <struct>
+          <member><name>id</name><value><int>1</int></value></member>
+          <member><name>id</name><value><int>2</int></value></member>
+        </struct>
+      </value>
+    </param>
+  </params>
+</methodResponse>
+""",
+    },
+    "http://localhost/test_xmlrpc_empty": {
+        "status": 200,
+        "body": dumps(([],), methodresponse=True),
+    },
+    "http://localhost/test_xmlrpc_nested_empty": {
+        "status": 200,
+        "body": dumps(
+            ([{"id": 1, "tags": []}, {"id": 2, "tags": ["a"]}],),
+            methodresponse=True,
+        ),
+    },
+    "http://localhost/test_xmlrpc_struct_empty": {
+        "status": 200,
+        "body": dumps(
+            ({"total": 0, "items": [], "errors": []},),
+            methodresponse=True,
+        ),
+    },
     "http://localhost/test_http_500": {
         "status": 500,
         "body": """
@@ -74,7 +141,11 @@ I am really broken
 
 
 class DummyAsyncClient:
+    def __init__(self):
+        self.headers = {}
+
     async def post(self, url, *args, **kwargs):
+        self.headers = kwargs.get("headers", {})
         response = RESPONSES[url]
         return Response(
             status_code=response["status"],
@@ -90,6 +161,23 @@ async def test_xmlrpc_ok():
     assert response == 1
 
 
+@pytest.mark.parametrize(
+    "timeout,expected",
+    [
+        pytest.param(5.0, {"X-XMLRPC-Timeout": "5.0"}, id="float"),
+        pytest.param(Timeout(1, read=3), {"X-XMLRPC-Timeout": "3"}, id="httpx"),
+        pytest.param(None, {}, id="none"),
+    ],
+)
+async def test_xmlrpc_timeout_header(timeout, expected):
+    session = DummyAsyncClient()
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_ok", session=session, timeout=timeout
+    )
+    await client.name.space.proxfyiedcall()
+    assert session.headers == expected
+
+
 async def test_xmlrpc_fault():
     client = ServerProxy(
         "http://localhost/test_xmlrpc_fault", session=DummyAsyncClient()
@@ -141,3 +229,181 @@ async def test_multicall():
     response = await mc()
     assert response[0] == 1
     assert response[1] == 2
+
+
+async def test_multicall_iter_chunks():
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_multi_ok", session=DummyAsyncClient()
+    )
+    mc = MultiCall(client)
+    for _ in range(4):
+        mc.name.space.proxfyiedcall()
+    responses = [list(resp) async for resp in mc.iter_chunks(chunk_size=2)]
+    assert responses == [[1, 2], [1, 2]]
+
+
+class SlowAsyncClient(DummyAsyncClient):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def post(self, url, *args, **kwargs):
+        self.calls += 1
+        if self.calls > 1:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                raise OSError("connection reset") from None
+        return await super().post(url, *args, **kwargs)
+
+
+async def test_multicall_iter_chunks_aclose():
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_multi_ok", session=SlowAsyncClient()
+    )
+    mc = MultiCall(client)
+    for _ in range(4):
+        mc.name.space.proxfyiedcall()
+    errors = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda loop, context: errors.append(context))
+    try:
+        chunks = mc.iter_chunks(chunk_size=1)
+        assert list(await chunks.__anext__()) == [1, 2]
+        await chunks.aclose()
+        del chunks
+        await asyncio.sleep(0)
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+    assert errors == []
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        pytest.param({"chunk_size": 0}, id="chunk_size"),
+        pytest.param({"max_concurrency": 0}, id="max_concurrency"),
+    ],
+)
+async def test_multicall_iter_chunks_invalid(params):
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_multi_ok", session=DummyAsyncClient()
+    )
+    mc = MultiCall(client)
+    with pytest.raises(ValueError):
+        async for _ in mc.iter_chunks(**params):
+            ...
+
+
+@dataclass
+class DataclassRow:
+    id: int
+    name: str
+
+
+class NamedTupleRow(NamedTuple):
+    id: int
+    name: str
+
+
+class TagsRow(NamedTuple):
+    id: int
+    tags: list[str]
+
+
+class SlotsRow:
+    __slots__ = ("id", "name")
+
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+
+
+@pytest.mark.parametrize("row_type", [DataclassRow, NamedTupleRow, SlotsRow])
+async def test_schema_rows(row_type: type):
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_rows",
+        session=DummyAsyncClient(),  # type: ignore[arg-type]
+        schemas={"list_rows": row_type},
+    )
+    response = await client.list_rows()
+    assert [type(row) for row in response[:2]] == [row_type, row_type]
+    assert [(row.id, row.name) for row in response[:2]] == [(1, "one"), (2, "two")]
+    assert response[2] == {"total": 2}
+
+
+async def test_schema_columnar():
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_rows",
+        session=DummyAsyncClient(),
+        schemas={"list_rows": RowSchema(NamedTupleRow, columnar=True)},
+    )
+    response = await client.list_rows()
+    assert response == [NamedTupleRow(1, "one"), NamedTupleRow(2, "two"), {"total": 2}]
+
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_columns",
+        session=DummyAsyncClient(),
+        schemas={"list_rows": RowSchema(NamedTupleRow, columnar=True)},
+    )
+    response = await client.list_rows()
+    assert response == {"id": array("q", [1, 2, 3]), "name": ["one", "two", "three"]}
+
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_empty",
+        session=DummyAsyncClient(),
+        schemas={"list_rows": RowSchema(NamedTupleRow, columnar=True)},
+    )
+    response = await client.list_rows()
+    assert response == {"id": [], "name": []}
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        pytest.param(
+            "http://localhost/test_xmlrpc_nested_empty",
+            {"id": array("q", [1, 2]), "tags": [[], ["a"]]},
+            id="row",
+        ),
+        pytest.param(
+            "http://localhost/test_xmlrpc_struct_empty",
+            {"total": 0, "items": [], "errors": []},
+            id="struct",
+        ),
+    ],
+)
+async def test_schema_columnar_nested_empty(url: str, expected: object):
+    client = ServerProxy(
+        url,
+        session=DummyAsyncClient(),  # type: ignore[arg-type]
+        schemas={"list_rows": RowSchema(TagsRow, columnar=True)},
+    )
+    response = await client.list_rows()
+    assert response == expected
+
+
+async def test_schema_duplicate_members():
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_duplicate_members",
+        session=DummyAsyncClient(),
+        schemas={"get_row": DataclassRow},
+    )
+    response = await client.get_row()
+    assert response == {"id": 2}
+
+
+async def test_schema_other_method():
+    client = ServerProxy(
+        "http://localhost/test_xmlrpc_rows",
+        session=DummyAsyncClient(),
+        schemas={"list_rows": DataclassRow},
+    )
+    response = await client.other()
+    assert response[0] == {"id": 1, "name": "one"}
+
+
+def test_schema_invalid():
+    with pytest.raises(TypeError):
+        RowSchema(dict)
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(module: str) -> set[str]:
+    proc = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(proc.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "module,lazy",
+    [
+        pytest.param("aioxmlrpc", {"importlib.metadata"}, id="package"),
+        pytest.param("aioxmlrpc.client", {"httpx", "importlib.metadata"}, id="client"),
+        pytest.param(
+            "aioxmlrpc.server",
+            {"httpx", "starlette", "uvicorn", "importlib.metadata"},
+            id="server",
+        ),
+    ],
+)
+def test_lazy_imports(module: str, lazy: set[str]):
+    assert imported_modules(module) & lazy == set()
+
+
+def test_version():
+    from importlib import metadata
+
+    import aioxmlrpc
+
+    assert aioxmlrpc.__version__ == metadata.version("aioxmlrpc")
+    with pytest.raises(AttributeError):
+        aioxmlrpc.nope  # type: ignore
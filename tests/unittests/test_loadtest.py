@@ -0,0 +1,115 @@
+from typing import Any
+
+import pytest
+
+from aioxmlrpc.loadtest import (
+    LoadTestReport,
+    _open_loop,
+    _parse_args,
+    percentile,
+    render_params,
+    run_load_test,
+)
+
+
+def test_render_params():
+    params = render_params(["{payload}", 1, {"data": ["<{payload}>"]}, None], "xxx")
+    assert params == ["xxx", 1, {"data": ["<xxx>"]}, None]
+
+
+@pytest.mark.parametrize(
+    "pct,expected",
+    [
+        pytest.param(0, 1, id="p0"),
+        pytest.param(50, 5, id="p50"),
+        pytest.param(90, 9, id="p90"),
+        pytest.param(99, 10, id="p99"),
+        pytest.param(100, 10, id="p100"),
+    ],
+)
+def test_percentile(pct: float, expected: float):
+    assert percentile([float(i) for i in range(1, 11)], pct) == expected
+
+
+def test_percentile_empty():
+    assert percentile([], 99) == 0.0
+
+
+def test_report():
+    report = LoadTestReport("closed", 2.0, [0.3, 0.1, 0.2, 0.4], faults=1, errors=0)
+    assert report.to_dict() == {
+        "mode": "closed",
+        "requests": 4,
+        "elapsed": 2.0,
+        "throughput": 2.0,
+        "faults": 1,
+        "errors": 0,
+        "fault_rate": 0.25,
+        "error_rate": 0.0,
+        "latency": {"p50": 0.2, "p90": 0.4, "p99": 0.4, "max": 0.4},
+    }
+    assert "throughput:  2.0 req/s" in report.format()
+
+
+def test_parse_args():
+    args = _parse_args(["http://localhost/RPC2", "echo", "-p", '["{payload}"]'])
+    assert args.params == ["{payload}"]
+    assert args.duration == 10.0
+    assert args.requests is None
+    assert args.rate is None
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        pytest.param(["-p", '{"a": 1}'], id="params"),
+        pytest.param(["-d", "0"], id="duration"),
+        pytest.param(["-d", "-1"], id="negative-duration"),
+        pytest.param(["-n", "0"], id="requests"),
+    ],
+)
+def test_parse_args_invalid(args: list[str]):
+    with pytest.raises(SystemExit):
+        _parse_args(["http://localhost/RPC2", "echo", *args])
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        pytest.param({}, id="unbounded"),
+        pytest.param({"duration": 0}, id="duration"),
+        pytest.param({"duration": -1}, id="negative-duration"),
+        pytest.param({"duration": 0, "rate": 100}, id="open-loop-duration"),
+        pytest.param({"requests": 0}, id="requests"),
+        pytest.param({"requests": -1, "rate": 100}, id="open-loop-requests"),
+        pytest.param({"requests": 1, "rate": 0}, id="rate"),
+        pytest.param({"requests": 1, "concurrency": 0}, id="concurrency"),
+    ],
+)
+async def test_run_load_test_invalid(params: dict[str, Any]):
+    with pytest.raises(ValueError):
+        await run_load_test("http://localhost/RPC2", "echo", **params)
+
+
+class CountingRecorder:
+    def __init__(self):
+        self.sent = 0
+
+    async def send(self, started_at: float) -> None:
+        self.sent += 1
+
+
+@pytest.mark.parametrize(
+    "duration,rate,requests,expected",
+    [
+        pytest.param(0.1, 200, None, 20, id="duration"),
+        pytest.param(0.011, 1000, None, 11, id="rounding"),
+        pytest.param(0.1, 200, 5, 5, id="requests"),
+    ],
+)
+async def test_open_loop_requests(
+    duration: float, rate: float, requests: int, expected: int
+):
+    recorder = CountingRecorder()
+    await _open_loop(recorder, rate, None, duration, requests)  # type: ignore[arg-type]
+    assert recorder.sent == expected
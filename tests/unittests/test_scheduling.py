@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from aioxmlrpc.scheduling import PriorityClass, Scheduler
+
+
+async def run(priority_class: PriorityClass, client: str, name: str, log: list[str]):
+    await priority_class.acquire(client)
+    try:
+        log.append(name)
+        await asyncio.sleep(0)
+    finally:
+        priority_class.release()
+
+
+async def test_unbounded():
+    priority_class = PriorityClass("default")
+    await priority_class.acquire("a")
+    await priority_class.acquire("a")
+    assert priority_class.active == 2
+    assert priority_class.wait_count == 2
+    assert priority_class.max_wait_time == 0
+
+
+async def test_fair_queuing():
+    priority_class = PriorityClass("heavy", max_concurrency=1)
+    log: list[str] = []
+    await priority_class.acquire("a")
+    tasks = [
+        asyncio.ensure_future(run(priority_class, client, name, log))
+        for client, name in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1")]
+    ]
+    await asyncio.sleep(0)
+    assert priority_class.queued == 4
+    priority_class.release()
+    await asyncio.gather(*tasks)
+    assert log == ["a1", "b1", "a2", "a3"]
+    assert priority_class.active == 0
+    assert priority_class.wait_count == 5
+    assert priority_class.max_wait_time > 0
+
+
+async def test_weighted_fair_queuing():
+    priority_class = PriorityClass("heavy", max_concurrency=1, weights={"a": 2.0})
+    log: list[str] = []
+    await priority_class.acquire("a")
+    tasks = [
+        asyncio.ensure_future(run(priority_class, client, name, log))
+        for client, name in [
+            ("b", "b1"),
+            ("b", "b2"),
+            ("a", "a1"),
+            ("a", "a2"),
+            ("a", "a3"),
+            ("a", "a4"),
+        ]
+    ]
+    await asyncio.sleep(0)
+    priority_class.release()
+    await asyncio.gather(*tasks)
+    assert log == ["a1", "b1", "a2", "a3", "b2", "a4"]
+
+
+async def test_cancel_queued():
+    priority_class = PriorityClass("heavy", max_concurrency=1)
+    await priority_class.acquire("a")
+    task = asyncio.ensure_future(priority_class.acquire("b"))
+    await asyncio.sleep(0)
+    assert priority_class.queued == 1
+    task.cancel()
+    await asyncio.sleep(0)
+    assert priority_class.queued == 0
+    assert priority_class.cancel_count == 1
+    assert priority_class.wait_count == 2
+    priority_class.release()
+    assert priority_class.active == 0
+    await priority_class.acquire("c")
+    assert priority_class.active == 1
+
+
+async def test_cancel_granted():
+    priority_class = PriorityClass("heavy", max_concurrency=1)
+    await priority_class.acquire("a")
+    task = asyncio.ensure_future(priority_class.acquire("b"))
+    await asyncio.sleep(0)
+    priority_class.release()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert priority_class.active == 0
+    assert priority_class.queued == 0
+    assert priority_class.cancel_count == 0
+
+
+def test_invalid_max_concurrency():
+    with pytest.raises(ValueError):
+        PriorityClass("heavy", max_concurrency=0)
+
+
+def test_scheduler():
+    scheduler = Scheduler()
+    heavy = scheduler.add_class("heavy", 2)
+    scheduler.weights["a"] = 3
+    scheduler.assign("compute", "heavy")
+    assert scheduler.get_class("compute") is heavy
+    assert scheduler.get_class("ping") is None
+    assert heavy.weights == {"a": 3}
+    with pytest.raises(ValueError):
+        scheduler.assign("compute", "unknown")
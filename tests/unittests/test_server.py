@@ -1,5 +1,17 @@
+import asyncio
+from xmlrpc.client import dumps, loads
+
 import pytest
-from aioxmlrpc.server import SimpleXMLRPCDispatcher
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from aioxmlrpc.accesslog import AccessLog, AccessRecord
+from aioxmlrpc.client import TIMEOUT_HEADER
+from aioxmlrpc.server import (
+    DEADLINE_EXCEEDED,
+    SimpleXMLRPCDispatcher,
+    SimpleXMLRPCServer,
+)
 
 
 RPC_CALL = """<?xml version='1.0'?>
@@ -85,3 +97,216 @@ async def test_multicall():
             "faultString": "ZeroDivisionError:division by zero",
         },
     ]
+
+
+async def test_marshall_deadline_exceeded():
+    cancelled = asyncio.Event()
+
+    async def division(x: int, y: int) -> float:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return x / y
+
+    d = SimpleXMLRPCDispatcher()
+    d.register_function(division)
+    deadline = asyncio.get_running_loop().time() + 0.01
+    resp = await d._marshaled_dispatch(RPC_CALL.format(8, 2), deadline=deadline)
+    assert resp.decode() == RPC_FAULT.format("deadline exceeded").replace(
+        "<int>1</int>", f"<int>{DEADLINE_EXCEEDED}</int>"
+    )
+    assert cancelled.is_set()
+
+
+async def test_marshall_deadline_in_time():
+    d = SimpleXMLRPCDispatcher()
+    d.register_function(lambda x, y: x / y, "division")
+    deadline = asyncio.get_running_loop().time() + 5
+    resp = await d._marshaled_dispatch(RPC_CALL.format(8, 2), deadline=deadline)
+    assert resp.decode() == RPC_RESPONSE.format("4.0")
+
+
+async def test_multicall_deadline_exceeded():
+    async def sleep(delay: float) -> float:
+        await asyncio.sleep(delay)
+        return delay
+
+    d = SimpleXMLRPCDispatcher()
+    d.register_function(sleep)
+    d.register_multicall_functions()
+    deadline = asyncio.get_running_loop().time() + 0.05
+    resp = await d._marshaled_dispatch(
+        dumps(
+            (
+                [
+                    {"methodName": "sleep", "params": [0]},
+                    {"methodName": "sleep", "params": [1]},
+                ],
+            ),
+            "system.multicall",
+        ),
+        deadline=deadline,
+    )
+    assert loads(resp)[0][0] == [
+        [0],
+        {"faultCode": DEADLINE_EXCEEDED, "faultString": "deadline exceeded"},
+    ]
+
+
+async def test_deadline_task_not_cancelled():
+    async def sleep(delay: float) -> float:
+        await asyncio.sleep(delay)
+        return delay
+
+    d = SimpleXMLRPCDispatcher()
+    d.register_function(sleep)
+    deadline = asyncio.get_running_loop().time() + 0.01
+    resp = await d._marshaled_dispatch(dumps((1,), "sleep"), deadline=deadline)
+    assert "deadline exceeded" in resp.decode()
+    # the cancellation of the deadline must not leak to the caller
+    task = asyncio.current_task()
+    if hasattr(task, "cancelling"):
+        assert task.cancelling() == 0  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "timeout,expected",
+    [
+        pytest.param("5", True, id="valid"),
+        pytest.param("0.5", True, id="float"),
+        pytest.param("nan", False, id="nan"),
+        pytest.param("inf", False, id="inf"),
+        pytest.param("-1", False, id="negative"),
+        pytest.param("0", False, id="zero"),
+        pytest.param("86400", False, id="too-large"),
+        pytest.param("abc", False, id="invalid"),
+    ],
+)
+async def test_get_deadline(timeout: str, expected: bool):
+    server = SimpleXMLRPCServer(("localhost", 0))
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "headers": [(TIMEOUT_HEADER.lower().encode(), timeout.encode())],
+        }
+    )
+    assert (server._get_deadline(request) is not None) is expected
+
+
+async def test_dispatch_priority_class():
+    running: list[int] = []
+    max_running: list[int] = []
+
+    async def compute(x: int) -> int:
+        running.append(x)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(x)
+        return x
+
+    d = SimpleXMLRPCDispatcher()
+    heavy = d.scheduler.add_class("heavy", 2)
+    d.register_function(compute, priority="heavy")
+    resp = await asyncio.gather(*(d._dispatch("compute", [i]) for i in range(6)))
+    assert resp == list(range(6))
+    assert max(max_running) == 2
+    assert heavy.wait_count == 6
+    assert heavy.active == 0
+
+
+async def test_dispatch_priority_class_deadline():
+    async def sleep(delay: float) -> float:
+        await asyncio.sleep(delay)
+        return delay
+
+    d = SimpleXMLRPCDispatcher()
+    heavy = d.scheduler.add_class("heavy", 1)
+    d.register_function(sleep, priority="heavy")
+    running = asyncio.ensure_future(d._dispatch("sleep", [0.1]))
+    await asyncio.sleep(0)
+    deadline = asyncio.get_running_loop().time() + 0.01
+    resp = await d._marshaled_dispatch(dumps((0,), "sleep"), deadline=deadline)
+    assert "deadline exceeded" in resp.decode()
+    assert heavy.queued == 0
+    assert heavy.cancel_count == 1
+    assert heavy.wait_count == 2
+    assert await running == 0.1
+
+
+async def test_register_function_decorator():
+    d = SimpleXMLRPCDispatcher()
+    d.scheduler.add_class("heavy", 1)
+
+    @d.register_function
+    def ping() -> str:
+        return "pong"
+
+    @d.register_function(name="division", priority="heavy")
+    def divide(x: int, y: int) -> float:
+        return x / y
+
+    assert ping() == "pong"
+    assert divide(8, 2) == 4.0
+    assert await d._dispatch("ping", []) == "pong"
+    assert await d._dispatch("division", [8, 2]) == 4.0
+    assert d.scheduler.get_class("division") is d.scheduler.classes["heavy"]
+
+
+def test_register_function_unknown_priority():
+    d = SimpleXMLRPCDispatcher()
+    with pytest.raises(ValueError):
+        d.register_function(lambda: None, "ping", priority="unknown")
+
+
+async def test_marshall_access_record():
+    d = SimpleXMLRPCDispatcher()
+    d.register_function(lambda x, y: x / y, "division")
+    d.register_multicall_functions()
+
+    record = AccessRecord()
+    await d._marshaled_dispatch(RPC_CALL.format(8, 0), record=record)
+    assert record.method == "division"
+    assert record.calls == 1
+    assert record.fault_code == 1
+
+    record = AccessRecord()
+    await d._marshaled_dispatch(
+        dumps(
+            (
+                [
+                    {"methodName": "division", "params": [8, 2]},
+                    {"methodName": "division", "params": [8, 0]},
+                ],
+            ),
+            "system.multicall",
+        ),
+        record=record,
+    )
+    assert record.method == "system.multicall"
+    assert record.calls == 2
+    assert record.fault_code is None
+
+
+def test_server_access_log():
+    sink: list[AccessRecord] = []
+    server = SimpleXMLRPCServer(
+        ("localhost", 0), access_log=AccessLog(sink=sink.extend)
+    )
+    server.register_function(lambda x, y: x / y, "division")
+    body = RPC_CALL.format(8, 2)
+    with TestClient(server.app) as client:
+        resp = client.post("/RPC2", content=body)
+    assert [(r.method, r.status, r.fault_code) for r in sink] == [
+        ("division", 200, None)
+    ]
+    assert sink[0].request_size == len(body)
+    assert sink[0].response_size == len(resp.content)
+    assert sink[0].client == "testclient"
+
+
+def test_server_no_access_log():
+    server = SimpleXMLRPCServer(("localhost", 0), logRequests=False)
+    assert server.access_log is None